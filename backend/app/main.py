@@ -1,13 +1,23 @@
 # backend/app/main.py
-import os, re, gzip, asyncio, requests, gc, shutil, json, time
+import os, re, io, asyncio, requests, shutil, time, multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
 from typing import Optional
 
 import numpy as np
-import xarray as xr
-from bs4 import BeautifulSoup
-from fastapi import FastAPI
+import orjson
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
+
+try:  # ISA-L inflate is several times faster than zlib; same API as stdlib gzip
+    from isal import igzip as gzip
+except ImportError:
+    import gzip
 
 # ----------------------- CONFIG -----------------------
 UA = "Mozilla/5.0 (mrms-radar/1.0; +render)"
@@ -19,82 +29,196 @@ S3_PREFIXES = [
     "CONUS/ReflectivityAtLowestAltitude_01.00/",
 ]
 
-# Accept 01.00 only (keep pattern strict)
+# Accept 01.00 only (keep pattern strict). Not anchored with `$` so it can be
+# scanned straight over the raw directory-listing HTML.
 PATTERN = re.compile(
-    r"MRMS_ReflectivityAtLowestAltitude_(?P<res>01\.00)_(?P<ts>\d{8}-\d{6})\.grib2\.gz$"
+    r"(?P<name>MRMS_ReflectivityAtLowestAltitude_(?P<res>01\.00)_(?P<ts>\d{8}-\d{6})\.grib2\.gz)(?![\w.])"
 )
+# Same pattern for scanning raw response bytes without decoding them first
+PATTERN_B = re.compile(PATTERN.pattern.encode())
+# <Key>…/MRMS_…grib2.gz</Key> in a raw S3 listing; group 1 is the full key
+S3_KEY_RE = re.compile(rb"<Key>((?:[^<]*/)?" + PATTERN_B.pattern + rb")</Key>")
 
 BASE_DIR    = os.path.dirname(__file__)
 STATIC_DIR  = os.path.join(BASE_DIR, "static")
-DATA_DIR    = os.path.join(BASE_DIR, "data")
+# scratch for the decompressed GRIB; point at a tmpfs (e.g. /dev/shm/mrms) to keep it off disk
+DATA_DIR    = os.getenv("DATA_DIR", os.path.join(BASE_DIR, "data"))
 
 # Aggressive decimation by default; you can lower to 8 if memory allows
 REFRESH_SECONDS = int(os.getenv("REFRESH_SECONDS", "600"))
 GRID_DECIMATE   = max(8, int(os.getenv("GRID_DECIMATE", "16")))
+# zlib level for latest.png; it is rewritten every refresh, so favour encode speed
+PNG_COMPRESS_LEVEL = int(os.getenv("PNG_COMPRESS_LEVEL", "1"))
+# refreshes one render process serves before it is replaced (caps RSS creep from eccodes/numpy)
+RENDER_MAX_TASKS = max(1, int(os.getenv("RENDER_MAX_TASKS", "20")))
+# how long a find_latest_filename() answer is reused before re-listing upstream
+LISTING_TTL_SECONDS = int(os.getenv("LISTING_TTL_SECONDS", "60"))
+# S3 listings start this far back from now (keys sort by timestamp, so older ones are skipped)
+S3_LOOKBACK_MINUTES = int(os.getenv("S3_LOOKBACK_MINUTES", "15"))
+# browser/CDN max-age for /static/latest.png (the frontend cache-busts it with ?t=<timestamp>)
+STATIC_MAX_AGE  = int(os.getenv("STATIC_MAX_AGE", "60"))
+# compressed-stream read buffer and gunzip copy block for download_gz
+READ_BUFFER_SIZE = 128 * 1024
+COPY_BUFFER_SIZE = 1024 * 1024
 CONUS_BOUNDS    = [[24.5, -125.0], [49.5, -66.5]]
+GRIB_MISSING    = -999.0   # bitmap-missing points decode to this (below the -5 dBZ cutoff)
 
 os.makedirs(STATIC_DIR, exist_ok=True)
 os.makedirs(DATA_DIR,   exist_ok=True)
 
-app = FastAPI()
+class CachedStaticFiles(StaticFiles):
+    def file_response(self, full_path, *args, **kwargs):
+        resp = super().file_response(full_path, *args, **kwargs)
+        # only latest.png is cache-busted by the frontend; latest.json is the same
+        # changing metadata /api/latest-meta serves no-cache, so match that
+        if os.path.basename(full_path) == "latest.png":
+            resp.headers.setdefault("Cache-Control", f"public, max-age={STATIC_MAX_AGE}")
+        else:
+            resp.headers.setdefault("Cache-Control", "no-cache")
+        return resp
+
+def _new_render_pool() -> ProcessPoolExecutor:
+    # spawn, not fork: the API process has event-loop and to_thread threads
+    return ProcessPoolExecutor(
+        max_workers=1,
+        mp_context=multiprocessing.get_context("spawn"),
+        max_tasks_per_child=RENDER_MAX_TASKS,
+    )
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Download/decode/encode run in one worker process, started lazily on the
+    # first refresh: the API process stays small and never blocks on it
+    app.state.render_pool = _new_render_pool()
+    try:
+        yield
+    finally:
+        # waits for an in-flight render; do that off the event loop
+        await asyncio.to_thread(app.state.render_pool.shutdown, cancel_futures=True)
+
+app = FastAPI(lifespan=lifespan)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
     allow_methods=["*"],
     allow_headers=["*"],
 )
-app.mount("/static", StaticFiles(directory=STATIC_DIR), name="static")
+app.mount("/static", CachedStaticFiles(directory=STATIC_DIR), name="static")
 
 _refresh_lock = asyncio.Lock()
 
+# One keep-alive session for NOAA + S3 so refreshes reuse TCP/TLS connections
+_SESSION = requests.Session()
+_SESSION.headers["User-Agent"] = UA
+_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=2,
+    pool_maxsize=4,
+    # also retry S3 "SlowDown"/gateway blips, not just connection errors
+    max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=(500, 502, 503, 504)),
+))
+
+# Validators + parsed names from the last NOAA directory listing (conditional GET)
+_DIR_CACHE: dict = {"etag": None, "last_modified": None, "names": []}
+
+# (monotonic time, url) of the last successful find_latest_filename()
+_LATEST: tuple = (0.0, None)
+
+# Upstream file behind the current latest.png (skip re-rendering the same one)
+_LAST_NAME: Optional[str] = None
+
+# GRIB of the render in flight; still set afterwards only if that render died
+_LAST_GRIB: Optional[str] = None
+
 # ----------------------- UTILITIES -----------------------
 def _s3_list_latest(prefix: str) -> Optional[str]:
-    params = {"list-type": "2", "prefix": prefix, "max-keys": "500"}
-    r = requests.get(f"{MRMS_S3}/", params=params, timeout=20, headers={"User-Agent": UA})
+    # keys are <prefix>YYYYMMDD/MRMS_<product>_YYYYMMDD-HHMMSS.grib2.gz and list in
+    # lexicographic (= time) order, so start just before "recent" instead of at
+    # the oldest key; crossing midnight still works since the next day sorts after
+    product = prefix.rstrip("/").rsplit("/", 1)[-1]
+    t = datetime.now(timezone.utc) - timedelta(minutes=S3_LOOKBACK_MINUTES)
+    start_after = f"{prefix}{t:%Y%m%d}/MRMS_{product}_{t:%Y%m%d-%H%M%S}.grib2.gz"
+    params = {"list-type": "2", "prefix": prefix, "start-after": start_after, "max-keys": "500"}
+    r = _SESSION.get(f"{MRMS_S3}/", params=params, timeout=20)
     r.raise_for_status()
 
-    from xml.etree import ElementTree as ET
-    root = ET.fromstring(r.text)
-    ns = {"s3": "http://s3.amazonaws.com/doc/2006-03-01/"}
-
-    keys = [el.text for el in root.findall(".//s3:Key", ns)]
-    matches = [k for k in keys if PATTERN.search(os.path.basename(k))]
-    if not matches:
+    # only matching <Key> values matter: one regex pass over the raw bytes,
+    # no XML DOM and no per-key basename/filter
+    latest = max((m.group(1) for m in S3_KEY_RE.finditer(r.content)), default=None)
+    if latest is None:
         return None
-    matches.sort()
-    return f"{MRMS_S3}/{matches[-1]}"
-
-def find_latest_filename() -> str:
-    # 1) Try the NOAA HTML directory (often fine locally)
-    try:
-        r = requests.get(MRMS_HTTP, timeout=20, headers={"User-Agent": UA})
-        r.raise_for_status()
-        soup = BeautifulSoup(r.text, "html.parser")
-        names = []
-        for a in soup.find_all("a"):
-            for s in ((a.get_text(strip=True) or ""), (a.get("href") or "")):
-                if PATTERN.search(s):
-                    names.append(s)
-                    break
-        if names:
-            names.sort()
-            return MRMS_HTTP + names[-1]
-    except Exception:
-        pass
-
-    # 2) S3 listing (strict 01.00° only)
-    for pfx in S3_PREFIXES:
-        url = _s3_list_latest(pfx)
-        if url:
-            return url
-    raise RuntimeError(f"No RALA 01.00 files found (tried: {', '.join(S3_PREFIXES)})")
+    return f"{MRMS_S3}/{latest.decode()}"
+
+def _http_list_latest() -> Optional[str]:
+    # NOAA HTML directory, with a conditional GET against the last listing
+    headers = {}
+    if _DIR_CACHE["etag"]:
+        headers["If-None-Match"] = _DIR_CACHE["etag"]
+    if _DIR_CACHE["last_modified"]:
+        headers["If-Modified-Since"] = _DIR_CACHE["last_modified"]
+    r = _SESSION.get(MRMS_HTTP, timeout=20, headers=headers)
+    if r.status_code == 304 and _DIR_CACHE["names"]:
+        return MRMS_HTTP + _DIR_CACHE["names"][-1]
+    r.raise_for_status()
+    # href and link text both carry the filename; the set drops the duplicate
+    names = sorted({m.group("name").decode() for m in PATTERN_B.finditer(r.content)})
+    if not names:
+        return None
+    _DIR_CACHE.update(
+        etag=r.headers.get("ETag"),
+        last_modified=r.headers.get("Last-Modified"),
+        names=names,
+    )
+    return MRMS_HTTP + names[-1]
+
+def _url_ts(url: str) -> str:
+    return PATTERN.search(os.path.basename(url)).group("ts")
+
+async def find_latest_filename(force: bool = False) -> str:
+    # MRMS publishes every ~2 min; reuse a recent answer instead of re-listing
+    # (force=True always re-lists)
+    global _LATEST
+    now = time.monotonic()
+    if not force and _LATEST[1] and now - _LATEST[0] < LISTING_TTL_SECONDS:
+        return _LATEST[1]
+
+    # NOAA HTML + S3 (strict 01.00° only) listed concurrently: lookup latency is
+    # the slowest listing, not the sum of them; the newest timestamp wins
+    results = await asyncio.gather(
+        asyncio.to_thread(_http_list_latest),
+        *(asyncio.to_thread(_s3_list_latest, pfx) for pfx in S3_PREFIXES),
+        return_exceptions=True,
+    )
+    urls = [u for u in results if isinstance(u, str)]
+    if not urls:
+        errors = [repr(e) for e in results if isinstance(e, BaseException)]
+        raise RuntimeError(
+            f"No RALA 01.00 files found (tried: NOAA HTTP, {', '.join(S3_PREFIXES)})"
+            + (f"; errors: {'; '.join(errors)}" if errors else "")
+        )
+    url = max(urls, key=_url_ts)
+    _LATEST = (now, url)
+    return url
 
 def _looks_like_grib2(path: str) -> bool:
+    # one open + fstat + two 4-byte preads: "GRIB" header and "7777" trailer,
+    # so a truncated file is caught before eccodes sees it.
+    # A missing file is just "not ok"
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return False
     try:
-        with open(path, "rb") as f:
-            return f.read(4) == b"GRIB"
-    except Exception:
+        size = os.fstat(fd).st_size
+        return (size >= 1024
+                and os.pread(fd, 4, 0) == b"GRIB"
+                and os.pread(fd, 4, size - 4) == b"7777")
+    except OSError:
         return False
+    finally:
+        os.close(fd)
+
+def _grib_path(url_or_name: str) -> str:
+    return os.path.join(DATA_DIR, os.path.basename(url_or_name)[:-3])
 
 def download_gz(url_or_name: str) -> str:
     if url_or_name.startswith("http"):
@@ -104,31 +228,34 @@ def download_gz(url_or_name: str) -> str:
         url = MRMS_HTTP + url_or_name
         name = url_or_name
 
-    gz_path = os.path.join(DATA_DIR, name)
-    grib_path = gz_path[:-3]
+    grib_path = _grib_path(name)
 
     def _fetch():
-        with requests.get(url, stream=True, timeout=120, headers={"User-Agent": UA}) as r:
+        # gunzip straight off the socket; no intermediate .gz on disk
+        with _SESSION.get(url, stream=True, timeout=120) as r:
             r.raise_for_status()
-            with open(gz_path, "wb") as f:
-                for chunk in r.iter_content(64 * 1024):
-                    if chunk:
-                        f.write(chunk)
-        with gzip.open(gz_path, "rb") as gzr, open(grib_path, "wb") as out:
-            shutil.copyfileobj(gzr, out, length=64 * 1024)
+            r.raw.decode_content = False
+            r.raw.auto_close = False  # BufferedReader must see EOF, not a closed file
+            # large socket reads -> fewer, bigger inflate calls
+            raw = io.BufferedReader(r.raw, buffer_size=READ_BUFFER_SIZE)
+            with gzip.GzipFile(fileobj=raw) as gzr, open(grib_path, "wb") as out:
+                shutil.copyfileobj(gzr, out, length=COPY_BUFFER_SIZE)
+
+    # missing or bad: fetch, and retry once if the result still fails the check
+    # (_fetch truncates, so no explicit remove is needed)
+    for attempt in range(2):
+        if _looks_like_grib2(grib_path):
+            break
         try:
-            os.remove(gz_path)
-        except OSError:
-            pass
-
-    if not os.path.exists(grib_path):
-        _fetch()
-
-    if (not os.path.exists(grib_path)) or os.path.getsize(grib_path) < 1024 or not _looks_like_grib2(grib_path):
-        for p in (gz_path, grib_path):
-            try: os.remove(p)
+            _fetch()
+        except Exception:
+            # GzipFile checks the gzip trailer (CRC32 + ISIZE) at EOF, so a
+            # corrupt or truncated transfer lands here; drop the partial
+            # GRIB (it would still pass the magic check) and retry once
+            try: os.remove(grib_path)
             except OSError: pass
-        _fetch()
+            if attempt:
+                raise
 
     return grib_path
 
@@ -142,98 +269,170 @@ def _make_palette() -> list[int]:
         (0.85, (255, 100,   0)),
         (1.00, (180,   0,  80)),
     ]
-    pal: list[int] = []
-    for i in range(256):
-        t = i / 255.0
-        for (t0, c0), (t1, c1) in zip(stops, stops[1:]):
-            if t <= t1:
-                f = 0.0 if t1 == t0 else (t - t0) / (t1 - t0)
-                r = int(c0[0] * (1 - f) + c1[0] * f)
-                g = int(c0[1] * (1 - f) + c1[1] * f)
-                b = int(c0[2] * (1 - f) + c1[2] * f)
-                pal.extend([r, g, b])
-                break
-    return pal
-
-def grib_to_png(grib_path: str, out_png: str) -> None:
+    ts = np.array([t for t, _ in stops])
+    cs = np.array([c for _, c in stops], dtype=np.float64)
+    t = np.arange(256) / 255.0
+    rgb = np.stack([np.interp(t, ts, cs[:, k]) for k in range(3)], axis=1)
+    return rgb.astype(np.uint8).ravel().tolist()
+
+# constant across refreshes: build once at import
+_PALETTE_BYTES = bytes(_make_palette())
+_TRANSPARENCY  = bytes([0] + [255] * 255)
+
+# dBZ -> palette index lookup table, built once at import.
+# Bin 0 is transparent; bins 1.. cover [DBZ_CUTOFF, DBZ_MAX], so anything
+# below the cutoff (or NaN) lands in bin 0 without a separate mask pass.
+DBZ_MIN, DBZ_MAX = 0.0, 75.0
+DBZ_CUTOFF = -5.0   # anything below is transparent
+_LUT_SIZE  = 4096
+_LUT_SCALE = (_LUT_SIZE - 2) / (DBZ_MAX - DBZ_CUTOFF)
+
+def _make_dbz_lut() -> np.ndarray:
+    dbz = DBZ_CUTOFF + (np.arange(_LUT_SIZE) - 1) / _LUT_SCALE
+    norm = np.clip((dbz - DBZ_MIN) / (DBZ_MAX - DBZ_MIN), 0.0, 1.0)
+    lut = (norm * 254 + 1).astype(np.uint8)
+    lut[0] = 0
+    return lut
+
+_DBZ_LUT = _make_dbz_lut()
+
+def _read_grib_values(grib_path: str) -> np.ndarray:
     """
-    Memory-conscious: open, slice aggressively, close immediately.
-    NOTE: cfgrib typically loads full field when you access .values.
-    On 01.00° + GRID_DECIMATE>=16 this fits under 512 MiB.
+    Decode the first (only) message of an MRMS GRIB2 file into a 2-D array,
+    rows north -> south. Missing points come back as GRIB_MISSING.
     """
-    gc.collect()
-    # Restrict to the first message only; disable persistent index file
-    ds = xr.open_dataset(
-        grib_path,
-        engine="cfgrib",
-        backend_kwargs={"indexpath": ""}
-    )
+    import eccodes  # only the render process needs the native library
+    with open(grib_path, "rb") as f:
+        gid = eccodes.codes_grib_new_from_file(f)
+    if gid is None:
+        raise RuntimeError(f"no GRIB message in {os.path.basename(grib_path)}")
     try:
-        # pick first data var
-        for _, da in ds.data_vars.items():
-            break
+        eccodes.codes_set(gid, "missingValue", GRIB_MISSING)
+        nj = eccodes.codes_get(gid, "Nj")
+        ni = eccodes.codes_get(gid, "Ni")
+        # float32 decode: half the peak of the default float64 full field
+        return eccodes.codes_get_array(gid, "values", np.float32).reshape(nj, ni)
+    finally:
+        eccodes.codes_release(gid)
 
-        # Access .values (loads); immediately downsample in-place
-        arr = da.values.astype("float32", copy=False)[::GRID_DECIMATE, ::GRID_DECIMATE]
+def _decimate(values: np.ndarray, step: int) -> np.ndarray:
+    """
+    Max-pool step x step blocks: the strongest echo in a block survives
+    (the usual choice for dBZ), and the GRIB_MISSING sentinel only wins
+    where the whole block is empty. reduceat pools a ragged last block over
+    the rows/cols it has, so nothing is cropped and the image still spans
+    the full CONUS_BOUNDS; the only allocations are the row-pooled strip
+    grid (1/step of the field) and the result, never a copy of the field.
+    """
+    rows = np.maximum.reduceat(values, np.arange(0, values.shape[0], step), axis=0)
+    return np.maximum.reduceat(rows, np.arange(0, values.shape[1], step), axis=1)
 
-        # Free dataset ASAP
-        try:
-            ds.close()
-        except Exception:
-            pass
-        del da
-        gc.collect()
-
-        # Post-process on the small array
-        mask = ~np.isfinite(arr) | (arr < -5.0)
-        norm = np.clip((arr - 0.0) / 75.0, 0.0, 1.0)
-        idx = (norm * 254 + 1).astype("uint8", copy=False)
-        idx[mask] = 0
-
-        del arr, mask, norm
-        gc.collect()
-
-        from PIL import Image
-        im = Image.fromarray(idx, mode="P")
-        im.putpalette(_make_palette())
-        im.info["transparency"] = bytes([0] + [255] * 255)
-        im.save(out_png, optimize=True)
-
-        del idx, im
-        gc.collect()
-    finally:
-        try:
-            ds.close()
-        except Exception:
-            pass
+def _grib_to_indices(grib_path: str) -> np.ndarray:
+    """
+    Decode -> decimate -> palette indices. Only the small uint8 result
+    leaves this function; the full field and the float grid are freed by
+    refcounting on return.
+    NOTE: eccodes always decodes the whole message.
+    """
+    # Immediately downsample; the full-resolution field is dropped here
+    arr = _decimate(_read_grib_values(grib_path), GRID_DECIMATE)
+
+    # Post-process on the small array: it is our own copy, so scale it in
+    # place with no float temporaries
+    arr -= DBZ_CUTOFF
+    arr *= _LUT_SCALE
+    arr += 1.0
+    np.nan_to_num(arr, copy=False, nan=0.0, posinf=0.0, neginf=0.0)
+    np.clip(arr, 0, _LUT_SIZE - 1, out=arr)
+    return _DBZ_LUT[arr.astype(np.int16)]  # 4096 bins fit int16: half the index bytes
+
+def grib_to_png(grib_path: str, out_png: str) -> None:
+    """
+    Memory-conscious: decode, slice aggressively, drop the full field.
+    On 01.00° + GRID_DECIMATE>=16 this fits under 512 MiB.
+    """
+    idx = _grib_to_indices(grib_path)
+
+    from PIL import Image
+    # wraps idx's buffer directly (no copy into Pillow)
+    im = Image.frombuffer("P", (idx.shape[1], idx.shape[0]), idx, "raw", "P", 0, 1)
+    im.putpalette(_PALETTE_BYTES)
+    im.info["transparency"] = _TRANSPARENCY
+    # write aside + rename so /static/latest.png never serves a half-written file
+    tmp = out_png + ".tmp"
+    im.save(tmp, format="PNG", optimize=False, compress_level=PNG_COMPRESS_LEVEL)
+    os.replace(tmp, out_png)
 
 def _meta_path() -> str:
     return os.path.join(STATIC_DIR, "latest.json")
 
-def write_meta(ts_str: str) -> None:
-    with open(_meta_path(), "w") as f:
-        json.dump({"timestamp": ts_str, "bounds": CONUS_BOUNDS}, f)
+def read_meta_timestamp() -> Optional[str]:
+    try:
+        with open(_meta_path(), "rb") as f:
+            return orjson.loads(f.read()).get("timestamp")
+    except (OSError, orjson.JSONDecodeError):
+        return None
 
-async def refresh_once_async() -> str:
-    async with _refresh_lock:
-        # nuke old GRIBs to keep disk+RSS low
-        for f in os.listdir(DATA_DIR):
-            if f.endswith(".grib2"):
-                try: os.remove(os.path.join(DATA_DIR, f))
-                except: pass
+_BOUNDS_JSON = orjson.dumps(CONUS_BOUNDS)
 
-        name = find_latest_filename()
-        ts = os.path.basename(name).split("_")[3].split(".")[0]
-        grib = download_gz(name)
-        out_png = os.path.join(STATIC_DIR, "latest.png")
+def write_meta(ts_str: str) -> None:
+    # ts_str is regex-matched digits/dash, safe to splice in unescaped.
+    # Write aside + rename so the frontend never reads a truncated file
+    path = _meta_path()
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(b'{"timestamp":"' + ts_str.encode() + b'","bounds":' + _BOUNDS_JSON + b"}")
+    os.replace(tmp, path)
+
+def _render_sync(name: str, ts: str, out_png: str) -> None:
+    # runs in the render process: download -> decode -> PNG + meta
+    grib = download_gz(name)
+    try:
         grib_to_png(grib, out_png)
         write_meta(ts)
-
+    finally:
         # remove grib ASAP
         try: os.remove(grib)
-        except: pass
+        except OSError: pass
+
+async def refresh_once_async(force: bool = False) -> str:
+    global _LAST_NAME, _LAST_GRIB
+    async with _refresh_lock:
+        # nuke a GRIB a failed previous refresh left behind to keep disk low
+        if _LAST_GRIB:
+            try: os.remove(_LAST_GRIB)
+            except OSError: pass
+            _LAST_GRIB = None
+
+        # blocking work runs off the event loop (listing in threads, rendering in
+        # the render process) so /health stays responsive during a refresh
+        name = await find_latest_filename(force)
+        ts = os.path.basename(name).split("_")[3].split(".")[0]
+        out_png = os.path.join(STATIC_DIR, "latest.png")
+        # same file as the one already rendered (this process, or before a restart)
+        if name == _LAST_NAME or ts == read_meta_timestamp():
+            if os.path.exists(out_png):
+                _LAST_NAME = name
+                return ts
+
+        # stays set only if the render process dies mid-way (its finally never
+        # ran); the next refresh then removes the GRIB
+        _LAST_GRIB = _grib_path(name)
+        loop = asyncio.get_running_loop()
+        try:
+            await loop.run_in_executor(app.state.render_pool, _render_sync, name, ts, out_png)
+        except BrokenProcessPool:
+            # worker was killed (e.g. OOM); start a fresh one for the next refresh
+            old, app.state.render_pool = app.state.render_pool, _new_render_pool()
+            old.shutdown(wait=False)
+            raise
+        except Exception:
+            # ordinary download/decode error: _render_sync already removed the GRIB
+            _LAST_GRIB = None
+            raise
+        _LAST_NAME = name
+        _LAST_GRIB = None
 
-        gc.collect()
         return ts
 
 # ----------------------- ROUTES -----------------------
@@ -258,13 +457,18 @@ async def latest_meta():
             return {"timestamp": ts, "bounds": CONUS_BOUNDS}
         except Exception as e:
             return {"error": f"refresh failed: {e}", "bounds": CONUS_BOUNDS}
-    with open(meta) as f:
-        return json.load(f)
+    # already JSON on disk; serve the bytes as-is instead of parse + re-encode
+    with open(meta, "rb") as f:
+        return Response(
+            content=f.read(),
+            media_type="application/json",
+            headers={"Cache-Control": "no-cache"},
+        )
 
 @app.get("/api/force-refresh")
 async def force_refresh():
     try:
-        ts = await refresh_once_async()
+        ts = await refresh_once_async(force=True)
         return {"status": "ok", "timestamp": ts}
     except Exception as e:
         return {"status": "error", "error": str(e)}
@@ -275,10 +479,10 @@ def debug_s3_head():
     for pfx in S3_PREFIXES:
         try:
             params = {"list-type": "2", "prefix": pfx, "max-keys": "100"}
-            r = requests.get(f"{MRMS_S3}/", params=params, timeout=20, headers={"User-Agent": UA})
+            r = _SESSION.get(f"{MRMS_S3}/", params=params, timeout=20)
             r.raise_for_status()
             from xml.etree import ElementTree as ET
-            root = ET.fromstring(r.text)
+            root = ET.fromstring(r.content)  # parser takes bytes; skip the str decode
             ns = {"s3": "http://s3.amazonaws.com/doc/2006-03-01/"}
             keys = [el.text for el in root.findall(".//s3:Key", ns)]
             out.append({"prefix": pfx, "count": len(keys), "tail": keys[-10:]})